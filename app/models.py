@@ -1,11 +1,18 @@
+import hashlib
 import logging
+import zlib
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 
+def url_hash(url):
+    """Return the SHA-256 digest used as the documents table key for a URL."""
+    return hashlib.sha256((url or "").encode("utf-8")).digest()
+
+
 async def store_serp_results_with_analysis(
-    connection, search_type, search_query, results, analysis_text
+    connection, search_type, search_query, results, analysis_text, texts=None
 ):
     async with connection.cursor() as cursor:
         # Insert into result_analysis and get the analysis ID
@@ -19,21 +26,39 @@ async def store_serp_results_with_analysis(
         )
         analysis_id = cursor.lastrowid
 
-        # Insert the SERP results linked to the analysis
-        serp_query = """
-        INSERT INTO serp_results (analysis_id, result_title, result_link, result_snippet, position)
+        # Upsert each result into documents, deduplicated by URL hash, and
+        # link it to the analysis through serp_results
+        document_query = """
+        INSERT INTO documents (url_hash, url, title, snippet, extracted_text)
         VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            id = LAST_INSERT_ID(id),
+            title = VALUES(title),
+            snippet = VALUES(snippet),
+            extracted_text = COALESCE(VALUES(extracted_text), extracted_text)
+        """
+        serp_query = """
+        INSERT IGNORE INTO serp_results (analysis_id, document_id, position)
+        VALUES (%s, %s, %s)
         """
 
+        texts = texts or {}
         for result in results:
-            data = (
-                analysis_id,
+            link = result.get("link")
+            text = texts.get(link)
+            document_data = (
+                url_hash(link),
+                link,
                 result.get("title"),
-                result.get("link"),
                 result.get("snippet"),
-                result.get("position"),
+                zlib.compress(text.encode("utf-8")) if text else None,
+            )
+            await cursor.execute(document_query, document_data)
+            document_id = cursor.lastrowid
+
+            await cursor.execute(
+                serp_query, (analysis_id, document_id, result.get("position"))
             )
-            await cursor.execute(serp_query, data)
 
         await connection.commit()
 
@@ -98,6 +98,7 @@ async def insert_search_results(query_type, query, search_results):
                 query,
                 search_results["results"],
                 search_results["analysis"],
+                search_results.get("texts"),
             )
             return analysis_id
 
@@ -167,11 +168,11 @@ async def get_last_rows():
             async with pool.acquire() as connection:
                 async with connection.cursor() as cursor:
                     query = """
-                    SELECT sr.*
-                    FROM serp_results sr 
-                    JOIN result_analysis ra ON sr.analysis_id = ra.id 
+                    SELECT d.id, sr.analysis_id, d.title, d.url, d.snippet, sr.position
+                    FROM serp_results sr
+                    JOIN documents d ON sr.document_id = d.id
                     WHERE sr.analysis_id = %s
-                    ORDER BY ra.search_datetime DESC
+                    ORDER BY sr.position
                     """
                     await cursor.execute(query, (id,))
                     rows = await cursor.fetchall()
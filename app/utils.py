@@ -336,4 +336,6 @@ async def run_search(query):
     reranked_documents = rerank_documents(query, similiar_documents, top_n=15)
     analysis = analyze_text(query, reranked_documents)
 
-    return {"results": results, "analysis": analysis}
+    texts = {url: data["text"] for url, data in scraped_data.items() if data}
+
+    return {"results": results, "analysis": analysis, "texts": texts}
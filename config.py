@@ -31,18 +31,88 @@ def create_table_if_not_exists(connection):
     ai_analysis TEXT
     );"""
 
+    query_documents = """
+    CREATE TABLE IF NOT EXISTS documents (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    url_hash BINARY(32) NOT NULL,
+    url TEXT,
+    title TEXT,
+    snippet TEXT,
+    extracted_text MEDIUMBLOB,
+    UNIQUE KEY uq_documents_url_hash (url_hash)
+    );"""
+
     query_serp_results = """
     CREATE TABLE IF NOT EXISTS serp_results (
-    id INT AUTO_INCREMENT PRIMARY KEY,
     analysis_id INT NOT NULL,
-    result_title TEXT,
-    result_link TEXT,
-    result_snippet TEXT,
-    position INT,
-    FOREIGN KEY (analysis_id) REFERENCES result_analysis(id) ON DELETE CASCADE
+    document_id INT NOT NULL,
+    position SMALLINT,
+    PRIMARY KEY (analysis_id, document_id),
+    KEY idx_serp_results_document_id (document_id),
+    FOREIGN KEY (analysis_id) REFERENCES result_analysis(id) ON DELETE CASCADE,
+    FOREIGN KEY (document_id) REFERENCES documents(id)
     );"""
 
-    queries = [query_result_analysis, query_serp_results]
+    for query in [query_result_analysis, query_documents]:
+        cursor = connection.cursor()
+        cursor.execute(query)
+        connection.commit()
+
+    if has_legacy_serp_results(connection):
+        migrate_legacy_serp_results(connection, query_serp_results)
+
+    cursor = connection.cursor()
+    cursor.execute(query_serp_results)
+    connection.commit()
+
+
+def has_legacy_serp_results(connection):
+    """Check whether serp_results still stores title, link and snippet inline."""
+    cursor = connection.cursor()
+    cursor.execute(
+        """
+        SELECT COUNT(*)
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE()
+        AND TABLE_NAME = 'serp_results'
+        AND COLUMN_NAME = 'result_link'
+        """
+    )
+    (count,) = cursor.fetchone()
+    return count > 0
+
+
+def migrate_legacy_serp_results(connection, query_serp_results):
+    """Move legacy serp_results rows into documents and the compact join table.
+
+    Links are deduplicated by SHA-256 of the URL, the same key the application
+    uses when inserting new results. When a link appears in several analyses,
+    the title and snippet of its most recent row are kept.
+    """
+    logger.info("Migrating legacy serp_results rows to documents...")
+
+    query_documents = """
+    INSERT IGNORE INTO documents (url_hash, url, title, snippet)
+    SELECT UNHEX(SHA2(COALESCE(result_link, ''), 256)), result_link, result_title, result_snippet
+    FROM serp_results
+    ORDER BY id DESC
+    """
+
+    query_links = """
+    INSERT IGNORE INTO serp_results_new (analysis_id, document_id, position)
+    SELECT sr.analysis_id, d.id, sr.position
+    FROM serp_results sr
+    JOIN documents d ON d.url_hash = UNHEX(SHA2(COALESCE(sr.result_link, ''), 256))
+    """
+
+    queries = [
+        query_documents,
+        "DROP TABLE IF EXISTS serp_results_new",
+        query_serp_results.replace("serp_results (", "serp_results_new (", 1),
+        query_links,
+        "RENAME TABLE serp_results TO serp_results_legacy, serp_results_new TO serp_results",
+        "DROP TABLE serp_results_legacy",
+    ]
 
     for query in queries:
         cursor = connection.cursor()